@@ -0,0 +1,438 @@
+"""Rewrite deprecated usages flagged by :mod:`deprecation_checker`.
+
+The rewrites are minimal: only the tokens naming a deprecated module, function or
+keyword argument are replaced, so formatting and comments are preserved.
+
+- Imports and calls of ``task_script_utils.convert_datetime_to_ts_format`` are rewritten
+  to ``task_script_utils.datetime_parser.utils.parsing.parse_with_formats``, as suggested
+  by the ``W1597`` and ``W1598`` messages. Aliases are kept.
+
+Only names bound by the rewritten imports are changed, so local variables and
+parameters which happen to share a deprecated name are left alone.
+
+Some usages can't be rewritten safely, and are reported instead:
+
+- ``write_file(..., file_category='IDS')``, as the ``W1599`` message doesn't name a
+  replacement.
+- ``from`` imports where only some of the names are deprecated, as these would need
+  the statement to be split.
+- Imports binding a name which is also bound by other statements, such as a fallback
+  in an ``except ImportError`` block, as its uses can't all be renamed.
+- Imports binding a name listed in ``__all__``, as other modules import it by name.
+
+Without ``--fix`` a unified diff of the changes is printed, and the exit status is 1 if
+any file would change. With ``--fix`` the files are also rewritten atomically. Either
+way, the exit status is 1 if any usage couldn't be fixed or any file couldn't be read.
+
+The rewrites rely on the end positions astroid gets from :mod:`ast`, so this requires
+Python 3.8 or later, unlike the checkers themselves.
+
+.. code-block:: console
+
+    $ python -m autofix --fix my_package main.py
+
+    --- main.py
+    +++ main.py
+    @@ -1,3 +1,3 @@
+    -from task_script_utils.convert_datetime_to_ts_format import convert_datetime_to_ts_format
+    +from task_script_utils.datetime_parser.utils.parsing import parse_with_formats
+
+    -convert_datetime_to_ts_format("2020-01-01", formats)
+    +parse_with_formats("2020-01-01", formats)
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import os
+import re
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import astroid
+from astroid import nodes
+
+from deprecation_checker import (
+    DEPRECATED_CONTEXT_ARGUMENT,
+    DEPRECATED_CONTEXT_FUNCTION,
+    DEPRECATED_CONTEXT_VALUE,
+)
+from find_pylint_targets import iter_python_files
+
+#: Replacement for each deprecated fully qualified module or function name.
+RENAMES = {
+    "task_script_utils.convert_datetime_to_ts_format": (
+        "task_script_utils.datetime_parser.utils.parsing"
+    ),
+    "task_script_utils.convert_datetime_to_ts_format.convert_datetime_to_ts_format": (
+        "task_script_utils.datetime_parser.utils.parsing.parse_with_formats"
+    ),
+}
+
+# An edit replaces the bytes between two offsets of the source.
+_Edit = Tuple[int, int, str]
+
+
+class _Binding(NamedTuple):
+    """A name bound by an import statement."""
+
+    #: Fully qualified name bound before fixing.
+    old: str
+    #: Fully qualified name bound after fixing.
+    new: str
+    #: New local name, if the import binds it under its deprecated name.
+    local_rename: Optional[str] = None
+
+
+def _dotted_pattern(name: str) -> str:
+    return r"\b" + r"\s*\.\s*".join(map(re.escape, name.split("."))) + r"\b"
+
+
+class _Fixer:
+    """Collect the edits fixing one module."""
+
+    def __init__(self, source: str) -> None:
+        self.module = astroid.parse(source)
+        self.content = source.encode("utf-8")
+        self.line_offsets = [0]
+        for line in self.content.splitlines(keepends=True):
+            self.line_offsets.append(self.line_offsets[-1] + len(line))
+        self.edits: List[_Edit] = []
+        #: Names bound by each import statement.
+        self.bindings: Dict[nodes.NodeNG, Dict[str, _Binding]] = {}
+        #: ``(line, column, reason)`` for each usage which can't be fixed.
+        self.unfixable: List[Tuple[int, int, str]] = []
+
+    def offset(self, line: int, column: int) -> int:
+        """Convert an astroid position, whose column counts UTF-8 bytes, to an offset."""
+        return self.line_offsets[line - 1] + column
+
+    def start(self, node: nodes.NodeNG) -> int:
+        return self.offset(node.lineno, node.col_offset)
+
+    def end(self, node: nodes.NodeNG) -> int:
+        return self.offset(node.end_lineno, node.end_col_offset)
+
+    def text(self, start: int, end: int) -> str:
+        return self.content[start:end].decode("utf-8")
+
+    def replace_name(self, node: nodes.NodeNG, start: int, old: str, new: str) -> int:
+        """Replace the (possibly dotted) ``old`` with ``new`` after ``start`` in ``node``."""
+        text = self.text(start, self.end(node))
+        match = re.search(_dotted_pattern(old), text)
+        if match is None:
+            # Not expected for parsed code, but never guess where to edit.
+            return start
+        match_start = start + len(text[: match.start()].encode("utf-8"))
+        match_end = match_start + len(match.group().encode("utf-8"))
+        if old != new:
+            self.edits.append((match_start, match_end, new))
+        return match_end
+
+    def visit_import(self, node: nodes.Import) -> None:
+        bindings = self.bindings.setdefault(node, {})
+        position = self.start(node)
+        for module_name, alias in node.names:
+            new_module_name = RENAMES.get(module_name, module_name)
+            position = self.replace_name(node, position, module_name, new_module_name)
+            if alias:
+                bindings[alias] = _Binding(module_name, new_module_name)
+            else:
+                # ``import a.b`` binds ``a``, which the rewrite leaves alone.
+                package = module_name.split(".", 1)[0]
+                bindings[package] = _Binding(package, package)
+
+    def visit_importfrom(self, node: nodes.ImportFrom) -> None:
+        if node.level:
+            return
+        renamed = {
+            name: RENAMES[f"{node.modname}.{name}"]
+            for name, _ in node.names
+            if f"{node.modname}.{name}" in RENAMES
+        }
+        new_modnames = {new.rsplit(".", 1)[0] for new in renamed.values()}
+        if len(new_modnames) > 1 or len(renamed) not in (0, len(node.names)):
+            self.unfixable.append(
+                (
+                    node.lineno,
+                    node.col_offset,
+                    "only some of the imported names are deprecated, "
+                    "split the import first",
+                )
+            )
+            return
+        bindings = self.bindings.setdefault(node, {})
+        position = self.start(node)
+        if renamed:
+            (new_modname,) = new_modnames
+            position = self.replace_name(node, position, node.modname, new_modname)
+        else:
+            position = self.replace_name(node, position, node.modname, node.modname)
+        position += re.search(r"\bimport\b", self.text(position, self.end(node))).end()
+        for name, alias in node.names:
+            if name == "*":
+                continue
+            old_name = f"{node.modname}.{name}"
+            new = renamed.get(name, old_name)
+            new_name = new.rsplit(".", 1)[1]
+            position = self.replace_name(node, position, name, new_name)
+            local_rename = new_name if not alias and new_name != name else None
+            bindings[alias or name] = _Binding(old_name, new, local_rename)
+
+    def binding(self, node: nodes.Name) -> Optional[_Binding]:
+        """Return the import binding ``node`` refers to, if it is unambiguous."""
+        _, assignments = node.lookup(node.name)
+        bindings = {
+            self.bindings.get(assignment, {}).get(node.name)
+            for assignment in assignments
+        }
+        if len(bindings) != 1:
+            return None
+        return bindings.pop()
+
+    def exported_names(self) -> Set[str]:
+        """Return the names listed in the module's ``__all__``."""
+        names = set()
+        for node in self.module.nodes_of_class((nodes.Assign, nodes.AugAssign)):
+            targets = node.targets if isinstance(node, nodes.Assign) else [node.target]
+            if (
+                node.scope() is self.module
+                and any(
+                    isinstance(target, nodes.AssignName) and target.name == "__all__"
+                    for target in targets
+                )
+                and isinstance(node.value, (nodes.List, nodes.Tuple))
+            ):
+                names.update(
+                    element.value
+                    for element in node.value.elts
+                    if isinstance(element, nodes.Const)
+                    and isinstance(element.value, str)
+                )
+        return names
+
+    def unsafe_imports(self, rewritten: Set[nodes.NodeNG]) -> Dict[nodes.NodeNG, str]:
+        """
+        Return why each of the ``rewritten`` import statements can't be rewritten.
+
+        Every use of a name bound by a rewritten statement must refer to that statement
+        alone, or it may be left with the deprecated name. Renamed names mustn't be
+        listed in ``__all__``, as other modules import them by name.
+        """
+        reasons: Dict[nodes.NodeNG, str] = {}
+        names = {name for node in rewritten for name in self.bindings[node]}
+        for node in self.module.nodes_of_class(nodes.Name):
+            if node.name not in names:
+                continue
+            _, assignments = node.lookup(node.name)
+            bindings = {
+                self.bindings.get(assignment, {}).get(node.name)
+                for assignment in assignments
+            }
+            if len(bindings) > 1:
+                for assignment in assignments:
+                    if assignment in rewritten:
+                        reasons.setdefault(
+                            assignment,
+                            f"{node.name} is also bound by other statements, "
+                            "so its uses can't be renamed",
+                        )
+        for name in self.exported_names():
+            for node in rewritten:
+                binding = self.bindings[node].get(name)
+                if binding is not None and binding.local_rename:
+                    reasons.setdefault(
+                        node, f"{name} is listed in __all__, so it can't be renamed"
+                    )
+        return reasons
+
+    def visit_chain(self, node: nodes.NodeNG) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Fix a name or attribute chain bound by an import.
+
+        Return its fully qualified name before and after fixing, or ``None`` if it
+        isn't bound by an import.
+        """
+        if isinstance(node, nodes.Name):
+            binding = self.binding(node)
+            if binding is None:
+                return None, None
+            if binding.local_rename:
+                self.edits.append(
+                    (self.start(node), self.end(node), binding.local_rename)
+                )
+            return binding.old, binding.new
+        if not isinstance(node, nodes.Attribute):
+            return None, None
+        edit_count = len(self.edits)
+        old_parent, new_parent = self.visit_chain(node.expr)
+        if old_parent is None:
+            return None, None
+        old = f"{old_parent}.{node.attrname}"
+        if old not in RENAMES:
+            return old, f"{new_parent}.{node.attrname}"
+        target_parent, target_name = RENAMES[old].rsplit(".", 1)
+        if new_parent != target_parent:
+            # The object the attribute is looked up on doesn't resolve to the new
+            # parent module, so spell the module out instead.
+            del self.edits[edit_count:]
+            self.edits.append(
+                (self.start(node.expr), self.end(node.expr), target_parent)
+            )
+        if node.attrname != target_name:
+            attr_end = self.end(node)
+            self.edits.append(
+                (attr_end - len(node.attrname.encode("utf-8")), attr_end, target_name)
+            )
+        return old, RENAMES[old]
+
+    def visit_call(self, node: nodes.Call) -> None:
+        """Report the calls flagged by the ``deprecated-context-api`` rule."""
+        if isinstance(node.func, nodes.Attribute):
+            function_name = node.func.attrname
+        elif isinstance(node.func, nodes.Name):
+            function_name = node.func.name
+        else:
+            return
+        if function_name != DEPRECATED_CONTEXT_FUNCTION:
+            return
+        for keyword in node.keywords or ():
+            if (
+                keyword.arg == DEPRECATED_CONTEXT_ARGUMENT
+                and isinstance(keyword.value, nodes.Const)
+                and keyword.value.value == DEPRECATED_CONTEXT_VALUE
+            ):
+                self.unfixable.append(
+                    (
+                        node.lineno,
+                        node.col_offset,
+                        f"{DEPRECATED_CONTEXT_ARGUMENT}={DEPRECATED_CONTEXT_VALUE!r} "
+                        f"has no automatic replacement",
+                    )
+                )
+
+    def fix(self) -> str:
+        """Return the fixed source."""
+        # Imports are rewritten first, so every use can be checked against them.
+        import_edits: Dict[nodes.NodeNG, List[_Edit]] = {}
+        for node in self.module.nodes_of_class((nodes.Import, nodes.ImportFrom)):
+            edit_count = len(self.edits)
+            if isinstance(node, nodes.Import):
+                self.visit_import(node)
+            else:
+                self.visit_importfrom(node)
+            if len(self.edits) > edit_count:
+                import_edits[node] = self.edits[edit_count:]
+        for node, reason in self.unsafe_imports(set(import_edits)).items():
+            self.unfixable.append((node.lineno, node.col_offset, reason))
+            # Leave the statement and every use of its names as they are.
+            self.bindings[node] = {}
+            for edit in import_edits[node]:
+                self.edits.remove(edit)
+        for node in self.module.nodes_of_class(
+            (nodes.Name, nodes.Attribute, nodes.Call)
+        ):
+            if isinstance(node, nodes.Call):
+                self.visit_call(node)
+            elif not (
+                isinstance(node.parent, nodes.Attribute) and node.parent.expr is node
+            ):
+                # Only visit chains from their outermost attribute.
+                self.visit_chain(node)
+        content = self.content
+        previous_start = len(content)
+        for start, end, replacement in sorted(self.edits, reverse=True):
+            if end > previous_start:
+                # Overlapping edits can't both be applied.
+                continue
+            content = content[:start] + replacement.encode("utf-8") + content[end:]
+            previous_start = start
+        return content.decode("utf-8")
+
+
+def fix_source(source: str) -> str:
+    """Return ``source`` with the deprecated usages rewritten."""
+    return _Fixer(source).fix()
+
+
+def _write_atomically(path: str, content: str) -> None:
+    """Replace the file at ``path``, so it is never left partially written."""
+    directory, file_name = os.path.split(os.path.abspath(path))
+    fd, temporary_path = tempfile.mkstemp(dir=directory, prefix=f".{file_name}.")
+    try:
+        with os.fdopen(
+            fd, "w", encoding="utf-8", newline=""
+        ) as fp:  # pylint: disable=invalid-name
+            fp.write(content)
+        os.chmod(temporary_path, os.stat(path).st_mode)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+def fix_file(path: str, write: bool) -> Tuple[str, List[str]]:
+    """
+    Fix the file at ``path``, returning a unified diff of the changes and any errors.
+
+    Errors include the usages which couldn't be fixed. The file is only rewritten if
+    ``write`` is true and the fixed source still parses.
+    """
+    # astroid's exceptions can't always be pickled back to the parent process, so
+    # errors are returned as messages.
+    try:
+        with open(
+            path, encoding="utf-8", newline=""
+        ) as fp:  # pylint: disable=invalid-name
+            source = fp.read()
+        fixer = _Fixer(source)
+        fixed = fixer.fix()
+        astroid.parse(fixed)
+    except (astroid.AstroidSyntaxError, UnicodeDecodeError) as error:
+        return "", [f"{path}: could not be fixed: {error}"]
+    errors = [
+        f"{path}:{line}:{column}: could not be fixed: {reason}"
+        for line, column, reason in sorted(fixer.unfixable)
+    ]
+    if fixed == source:
+        return "", errors
+    if write:
+        _write_atomically(path, fixed)
+    diff = "".join(
+        difflib.unified_diff(
+            source.splitlines(keepends=True),
+            fixed.splitlines(keepends=True),
+            fromfile=path,
+            tofile=path,
+        )
+    )
+    return diff, errors
+
+
+def main(args: List[str]) -> int:
+    """Print the fixes for the targets, applying them with ``--fix``."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("targets", nargs="+")
+    parser.add_argument("--fix", action="store_true", help="Rewrite the files")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parsed_args = parser.parse_args(args)
+    if sys.version_info < (3, 8):
+        parser.error("Python 3.8 or later is required to fix files")
+
+    paths = list(iter_python_files(parsed_args.targets))
+    changed = failed = False
+    with ProcessPoolExecutor(parsed_args.jobs) as pool:
+        for diff, errors in pool.map(fix_file, paths, [parsed_args.fix] * len(paths)):
+            sys.stdout.write(diff)
+            for error in errors:
+                print(error, file=sys.stderr)
+            changed = changed or bool(diff)
+            failed = failed or bool(errors)
+    return 1 if failed or (changed and not parsed_args.fix) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
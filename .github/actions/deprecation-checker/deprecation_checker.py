@@ -26,6 +26,22 @@ from pylint.interfaces import IAstroidChecker
 if TYPE_CHECKING:
     from pylint.lint import PyLinter
 
+#: Fully qualified calls flagged as ``deprecated-task-script-util-datetime-parser-use``.
+DEPRECATED_DATETIME_PARSER_CALLS = (
+    "task_script_utils.convert_datetime_to_ts_format.convert_datetime_to_ts_format",
+)
+#: Modules flagged as ``deprecated-task-script-util-datetime-parser-import`` by ``import X``.
+DEPRECATED_DATETIME_PARSER_MODULES = (
+    "task_script_utils.convert_datetime_to_ts_format",
+)
+#: Names flagged as ``deprecated-task-script-util-datetime-parser-import`` by
+#: ``from task_script_utils... import Y``.
+DEPRECATED_DATETIME_PARSER_NAMES = ("convert_datetime_to_ts_format",)
+#: Function, keyword argument and literal value flagged as ``deprecated-context-api``.
+DEPRECATED_CONTEXT_FUNCTION = "write_file"
+DEPRECATED_CONTEXT_ARGUMENT = "file_category"
+DEPRECATED_CONTEXT_VALUE = "IDS"
+
 
 class ContextAPIDeprecationChecker(BaseChecker):
     """
@@ -58,13 +74,16 @@ class ContextAPIDeprecationChecker(BaseChecker):
             # Not interested in other nodes.
             return
 
-        if function_name != "write_file":
+        if function_name != DEPRECATED_CONTEXT_FUNCTION:
             return
         for arg in node.keywords:
             argname = arg.arg
-            if argname != "file_category":
+            if argname != DEPRECATED_CONTEXT_ARGUMENT:
                 continue
-            if hasattr(arg.value, "value") and arg.value.value == "IDS":
+            if (
+                hasattr(arg.value, "value")
+                and arg.value.value == DEPRECATED_CONTEXT_VALUE
+            ):
                 # If `write_file` is passed a variable, `arg.value` will not have
                 # attribute `value`. In this case, it's not possible to infer whether
                 # it's value is "IDS".
@@ -98,7 +117,8 @@ class TaskScriptUtilDeprecationChecker(BaseChecker):
     }
     _ts_task_script_util_imports: Dict[str, str] = {}
 
-    def unroll_function(self, func: nodes.NodeNG) -> List[str]:
+    @staticmethod
+    def unroll_function(func: nodes.NodeNG) -> List[str]:
         """
         Convert a function call into a list of its objects.
 
@@ -158,9 +178,7 @@ class TaskScriptUtilDeprecationChecker(BaseChecker):
 
         full_path = ".".join(path)
 
-        if full_path in (
-            "task_script_utils.convert_datetime_to_ts_format.convert_datetime_to_ts_format",
-        ):
+        if full_path in DEPRECATED_DATETIME_PARSER_CALLS:
             # the call path for this function is a deprecated function
             self.add_message(
                 "deprecated-task-script-util-datetime-parser-use", node=node
@@ -171,9 +189,7 @@ class TaskScriptUtilDeprecationChecker(BaseChecker):
         for module, alias in node.names:
             if "task_script_utils" not in module:
                 continue
-            if module in (
-                "task_script_utils.convert_datetime_to_ts_format",
-            ):
+            if module in DEPRECATED_DATETIME_PARSER_MODULES:
                 # Direct import of deprecated function or module
                 self.add_message(
                     "deprecated-task-script-util-datetime-parser-import", node=node
@@ -192,7 +208,7 @@ class TaskScriptUtilDeprecationChecker(BaseChecker):
             return
 
         for name, alias in node.names:
-            if name  == "convert_datetime_to_ts_format":
+            if name in DEPRECATED_DATETIME_PARSER_NAMES:
                 # direct import of deprecated function
                 self.add_message(
                     "deprecated-task-script-util-datetime-parser-import", node=node
@@ -0,0 +1,247 @@
+"""Cache the facts the deprecation checkers rely on, so rules can run without re-parsing.
+
+Each file is parsed once with astroid and reduced to the facts used by the checkers in
+:mod:`deprecation_checker`: its imports (with aliases), the dotted path of every call
+and the literal keyword arguments passed to it. The facts are stored in a SQLite index
+keyed by a hash of the file contents, so adding or changing a rule only costs a scan of
+the index instead of a parse of the whole repository.
+
+.. code-block:: console
+
+    $ python -m fact_cache --cache facts.sqlite test/error_examples
+
+    test/error_examples/context_deprecation.py:1:0: W1599: Deprecated keyword argument file_category='IDS' passed to Context.write_file() (deprecated-context-api)
+    ...
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import zlib
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+import astroid
+from astroid import nodes
+
+from deprecation_checker import (
+    DEPRECATED_CONTEXT_ARGUMENT,
+    DEPRECATED_CONTEXT_FUNCTION,
+    DEPRECATED_CONTEXT_VALUE,
+    DEPRECATED_DATETIME_PARSER_CALLS,
+    DEPRECATED_DATETIME_PARSER_MODULES,
+    DEPRECATED_DATETIME_PARSER_NAMES,
+    ContextAPIDeprecationChecker,
+    TaskScriptUtilDeprecationChecker,
+)
+from find_pylint_targets import iter_python_files
+
+#: Bump whenever :func:`extract_facts` changes, so stale cache entries are ignored.
+FACTS_VERSION = 1
+#: Default location of the SQLite fact index.
+DEFAULT_CACHE_PATH = ".deprecation-checker-facts.sqlite"
+
+#: Message ID and text for each message symbol, as registered with pylint.
+_MESSAGES = {
+    symbol: (msg_id, text)
+    for checker in (ContextAPIDeprecationChecker, TaskScriptUtilDeprecationChecker)
+    for msg_id, (text, symbol, _) in checker.msgs.items()
+}
+
+
+class Finding(NamedTuple):
+    """A deprecated usage found by evaluating the rules against a file's facts."""
+
+    line: int
+    column: int
+    symbol: str
+
+    @property
+    def msg_id(self) -> str:
+        """The pylint message ID, such as ``W1599``."""
+        return _MESSAGES[self.symbol][0]
+
+    @property
+    def message(self) -> str:
+        """The pylint message text."""
+        return _MESSAGES[self.symbol][1]
+
+
+def hash_content(content: bytes) -> str:
+    """Return the cache key for a file's contents."""
+    return f"{FACTS_VERSION}:{hashlib.sha256(content).hexdigest()}"
+
+
+def extract_facts(source: str) -> Dict[str, List[Any]]:
+    """
+    Parse ``source`` and extract the facts needed to evaluate the deprecation rules.
+
+    The result is JSON serializable:
+
+    - ``imports``: ``[line, column, module, name, alias]`` for each imported name.
+      ``name`` is ``None`` for ``import X`` statements.
+    - ``calls``: ``[line, column, function_name, full_path, keywords]`` for each call.
+      ``full_path`` is the dotted call path with its first element resolved through the
+      imports seen so far, or ``""`` if the call can't be unrolled. ``keywords`` lists
+      ``[argument, value]`` for each keyword argument passed a literal.
+    """
+    module = astroid.parse(source)
+    aliases: Dict[str, str] = {}
+    imports: List[Any] = []
+    calls: List[Any] = []
+    # ``nodes_of_class`` walks the tree in source order, like pylint visits it, so
+    # aliases are resolved the same way as in the checkers.
+    for node in module.nodes_of_class((nodes.Import, nodes.ImportFrom, nodes.Call)):
+        if isinstance(node, nodes.Import):
+            for module_name, alias in node.names:
+                imports.append([node.lineno, node.col_offset, module_name, None, alias])
+                if alias:
+                    aliases[alias] = module_name
+        elif isinstance(node, nodes.ImportFrom):
+            module_name = "." * (node.level or 0) + node.modname
+            for name, alias in node.names:
+                imports.append([node.lineno, node.col_offset, module_name, name, alias])
+                if name != "*":
+                    aliases[alias or name] = f"{module_name}.{name}"
+        elif isinstance(node.func, (nodes.Attribute, nodes.Name)):
+            if isinstance(node.func, nodes.Attribute):
+                function_name = node.func.attrname
+            else:
+                function_name = node.func.name
+            path = TaskScriptUtilDeprecationChecker.unroll_function(node.func)
+            if path:
+                path[0] = aliases.get(path[0], path[0])
+            keywords = [
+                [keyword.arg, keyword.value.value]
+                for keyword in node.keywords or ()
+                if keyword.arg is not None
+                and isinstance(keyword.value, nodes.Const)
+                and isinstance(keyword.value.value, (str, int, float, bool, type(None)))
+            ]
+            calls.append(
+                [node.lineno, node.col_offset, function_name, ".".join(path), keywords]
+            )
+    return {"imports": imports, "calls": calls}
+
+
+def check_facts(facts: Dict[str, List[Any]]) -> List[Finding]:
+    """Evaluate the deprecation rules of :mod:`deprecation_checker` against ``facts``."""
+    findings = []
+    for line, column, module_name, name, _ in facts["imports"]:
+        if name is None:
+            deprecated = module_name in DEPRECATED_DATETIME_PARSER_MODULES
+        else:
+            deprecated = (
+                "task_script_utils" in module_name
+                and name in DEPRECATED_DATETIME_PARSER_NAMES
+            )
+        if deprecated:
+            findings.append(
+                Finding(
+                    line, column, "deprecated-task-script-util-datetime-parser-import"
+                )
+            )
+    for line, column, function_name, full_path, keywords in facts["calls"]:
+        if full_path in DEPRECATED_DATETIME_PARSER_CALLS:
+            findings.append(
+                Finding(line, column, "deprecated-task-script-util-datetime-parser-use")
+            )
+        # Same rule as :meth:`ContextAPIDeprecationChecker.visit_call`.
+        if (
+            function_name == DEPRECATED_CONTEXT_FUNCTION
+            and [
+                DEPRECATED_CONTEXT_ARGUMENT,
+                DEPRECATED_CONTEXT_VALUE,
+            ]
+            in keywords
+        ):
+            findings.append(Finding(line, column, "deprecated-context-api"))
+    return sorted(findings)
+
+
+class FactCache:
+    """SQLite index of extracted facts, keyed by :func:`hash_content`."""
+
+    def __init__(
+        self, path: str = DEFAULT_CACHE_PATH, check_same_thread: bool = True
+    ) -> None:
+        self._connection = sqlite3.connect(path, check_same_thread=check_same_thread)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS facts (content_hash TEXT PRIMARY KEY, facts BLOB NOT NULL)"
+        )
+
+    def __enter__(self) -> FactCache:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Persist any new facts and close the index."""
+        self._connection.commit()
+        self._connection.close()
+
+    def get(self, content_hash: str) -> Optional[Dict[str, List[Any]]]:
+        """Return the cached facts for ``content_hash``, or ``None`` if not cached."""
+        row = self._connection.execute(
+            "SELECT facts FROM facts WHERE content_hash = ?", (content_hash,)
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, content_hash: str, facts: Dict[str, List[Any]]) -> None:
+        """Store ``facts`` for ``content_hash``."""
+        blob = zlib.compress(json.dumps(facts, separators=(",", ":")).encode("utf-8"))
+        self._connection.execute(
+            "INSERT OR REPLACE INTO facts (content_hash, facts) VALUES (?, ?)",
+            (content_hash, blob),
+        )
+
+    def facts_for_file(self, path: str) -> Dict[str, List[Any]]:
+        """Return the facts for the file at ``path``, parsing it only on a cache miss."""
+        with open(path, "rb") as fp:  # pylint: disable=invalid-name
+            content = fp.read()
+        content_hash = hash_content(content)
+        facts = self.get(content_hash)
+        if facts is None:
+            facts = extract_facts(content.decode("utf-8"))
+            self.put(content_hash, facts)
+        return facts
+
+
+def check_files(cache: FactCache, paths: Iterable[str]) -> int:
+    """Print the findings for ``paths`` in pylint's format and return how many there are."""
+    count = 0
+    for path in paths:
+        try:
+            facts = cache.facts_for_file(path)
+        except (astroid.AstroidSyntaxError, UnicodeDecodeError) as error:
+            print(f"{path}: could not be parsed: {error}", file=sys.stderr)
+            continue
+        for finding in check_facts(facts):
+            print(
+                f"{path}:{finding.line}:{finding.column}: {finding.msg_id}: "
+                f"{finding.message} ({finding.symbol})"
+            )
+            count += 1
+    return count
+
+
+def main(args: List[str]) -> int:
+    """Check the targets using the fact index, returning 1 if anything was found."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("targets", nargs="+")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH)
+    parsed_args = parser.parse_args(args)
+
+    with FactCache(parsed_args.cache) as cache:
+        count = check_files(cache, iter_python_files(parsed_args.targets))
+    return 1 if count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
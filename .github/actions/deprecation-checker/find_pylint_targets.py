@@ -3,27 +3,103 @@ Find Python files on which to run the Context API checker.
 """
 import argparse
 import glob
+import hashlib
 import os
 import sys
-from typing import List
+from typing import Iterable, Iterator, List
 
 from setuptools import find_packages
 
 
+def iter_python_files(targets: Iterable[str]) -> Iterator[str]:
+    """
+    Yield the Python files in ``targets``, walking any directories in sorted order.
+
+    Hidden directories, such as ``.git`` and ``.venv``, are skipped.
+    """
+    for target in targets:
+        if os.path.isdir(target):
+            for root, dirs, files in os.walk(target):
+                dirs[:] = sorted(dir_ for dir_ in dirs if not dir_.startswith("."))
+                for file_name in sorted(files):
+                    if file_name.endswith(".py"):
+                        yield os.path.join(root, file_name)
+        elif target.endswith(".py"):
+            yield target
+
+
+def iter_module_files(targets: Iterable[str]) -> Iterator[str]:
+    """
+    Yield the Python files pylint checks when given ``targets``, in sorted order.
+
+    Like pylint, directories are only descended into while they are packages, so
+    directories without an ``__init__.py`` are skipped.
+    """
+    for target in targets:
+        if os.path.isdir(target):
+            for root, dirs, files in os.walk(target):
+                if "__init__.py" not in files:
+                    dirs[:] = []
+                    continue
+                dirs.sort()
+                for file_name in sorted(files):
+                    if file_name.endswith(".py"):
+                        yield os.path.join(root, file_name)
+        elif target.endswith(".py"):
+            yield target
+
+
+def iter_targets(dir_: str) -> Iterator[str]:
+    """Yield the paths of the top level Python files, then the top level packages."""
+    # The top level files are yielded before searching for packages, so callers can
+    # start checking them straight away.
+    for path in glob.glob(os.path.join(glob.escape(dir_), "*.py")):
+        yield os.path.normpath(path)
+    python_packages = find_packages(where=os.path.relpath(dir_, "."))
+    for package in python_packages:
+        if "." not in package:
+            yield os.path.normpath(os.path.join(dir_, package.replace(".", os.sep)))
+
+
+def shard_of(path: str, shard_count: int) -> int:
+    """Assign ``path`` to one of ``shard_count`` shards, the same way on every runner."""
+    # ``hash()`` is salted per process, so it can't be shared between CI jobs.
+    digest = hashlib.sha256(path.replace(os.sep, "/").encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shard_count
+
+
 def main(args: List[str]) -> None:
-    """Print the top level Python packages to run pylint on."""
+    """
+    Print the top level Python packages to run pylint on.
+
+    With ``--shard-count N``, the Python files pylint would check in those packages are
+    split into ``N`` shards instead, and only those in shard ``--shard-index`` are
+    printed.
+    """
     parser = argparse.ArgumentParser()
     parser.add_argument("dir_")
     parser.add_argument("out")
+    parser.add_argument("--shard-index", type=int, default=0)
+    parser.add_argument("--shard-count", type=int, default=1)
     parsed_args = parser.parse_args(args)
+    if not 0 <= parsed_args.shard_index < parsed_args.shard_count:
+        parser.error("--shard-index must be at least 0 and less than --shard-count")
 
-    python_packages = find_packages(where=os.path.relpath(parsed_args.dir_, "."))
-    top_level_packages = [package for package in python_packages if "." not in package]
-    top_level_python_files = glob.glob("*.py")
+    targets = list(iter_targets(parsed_args.dir_))
+    if parsed_args.shard_count > 1:
+        targets = [
+            path
+            for path in iter_module_files(targets)
+            # Shard on the path within the directory, which is the same on every runner.
+            if shard_of(
+                os.path.relpath(path, parsed_args.dir_), parsed_args.shard_count
+            )
+            == parsed_args.shard_index
+        ]
     with open(
         parsed_args.out, "w", encoding="utf-8"
     ) as fp:  # pylint: disable=invalid-name
-        fp.write(" ".join((*top_level_python_files, *top_level_packages)))
+        fp.write(" ".join(targets))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+"""Merge the pylint JSON results of sharded runs into a single report and exit status.
+
+Each shard runs pylint on the files :mod:`find_pylint_targets` assigns to it, with
+``--output-format=json:<shard results>,text``. This prints the combined messages in
+pylint's text format, optionally writes them to a single JSON file, and exits with the
+status a single pylint run over all the files would have had.
+
+.. code-block:: console
+
+    $ python -m merge_results --shard-count 3 --out results.json shard-*.json
+
+    main.py:6:4: W1599: Deprecated keyword argument file_category='IDS' passed to Context.write_file() (deprecated-context-api)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional
+
+#: Bit set in pylint's exit status for each message type.
+EXIT_STATUS_BITS = {
+    "fatal": 1,
+    "error": 2,
+    "warning": 4,
+    "refactor": 8,
+    "convention": 16,
+}
+
+
+def merge(results: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Combine the messages of each shard, ordered by location."""
+    # The shards check disjoint files, so identical messages are genuine duplicates.
+    return sorted(
+        (message for shard_messages in results for message in shard_messages),
+        key=lambda message: (
+            message["path"],
+            message["line"],
+            message["column"],
+            message["message-id"],
+        ),
+    )
+
+
+def exit_status(messages: List[Dict[str, Any]]) -> int:
+    """Return the exit status pylint would have had for ``messages``."""
+    status = 0
+    for message in messages:
+        status |= EXIT_STATUS_BITS.get(message["type"], 0)
+    return status
+
+
+def main(args: List[str]) -> int:
+    """Print the merged results of the shards and return the combined exit status."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("results", nargs="+", help="JSON results of each shard")
+    parser.add_argument(
+        "--shard-count",
+        type=int,
+        help="Fail unless there are results for exactly this many shards",
+    )
+    parser.add_argument("--out", help="Write the merged results to this JSON file")
+    parsed_args = parser.parse_args(args)
+    shard_count: Optional[int] = parsed_args.shard_count
+    if shard_count is not None and len(parsed_args.results) != shard_count:
+        parser.error(
+            f"expected results for {shard_count} shards, "
+            f"got {len(parsed_args.results)}"
+        )
+
+    results = []
+    for path in parsed_args.results:
+        with open(path, encoding="utf-8") as fp:  # pylint: disable=invalid-name
+            results.append(json.load(fp))
+    messages = merge(results)
+    if parsed_args.out:
+        with open(
+            parsed_args.out, "w", encoding="utf-8"
+        ) as fp:  # pylint: disable=invalid-name
+            json.dump(messages, fp, indent=4)
+    for message in messages:
+        print(
+            f"{message['path']}:{message['line']}:{message['column']}: "
+            f"{message['message-id']}: {message['message']} ({message['symbol']})"
+        )
+    return exit_status(messages)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,231 @@
+"""Run the deprecation rules with the setup steps of ``action.yaml`` overlapped.
+
+``action.yaml`` runs target discovery and the checks one after the other. This script
+runs target discovery and the warm-up of the worker processes concurrently with
+:mod:`asyncio`, and starts checking files as soon as they are discovered. Each file is
+looked up in the :mod:`fact_cache` index by its content hash, from a pool of threads
+with a connection each, and only files missing from it are parsed in the workers.
+
+The findings are printed in pylint's format, and the time at which each stage finished
+is reported on stderr, along with the critical path.
+
+.. code-block:: console
+
+    $ python -m run_checks --cache .deprecation-checker-facts.sqlite .
+
+    main.py:6:4: W1599: Deprecated keyword argument file_category='IDS' passed to Context.write_file() (deprecated-context-api)
+    first target: 0.001s
+    discovery: 0.012s
+    warm-up: 0.310s
+    checks: 0.402s (42 files, 3 parsed)
+    critical path: 0.402s (warm-up 0.310s + 0.092s checking)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import astroid
+
+from fact_cache import (
+    DEFAULT_CACHE_PATH,
+    FactCache,
+    Finding,
+    check_facts,
+    extract_facts,
+    hash_content,
+)
+from find_pylint_targets import iter_python_files, iter_targets
+
+#: Stages which run concurrently before the checks can all finish.
+SETUP_STAGES = ("discovery", "warm-up")
+
+
+class CheckRun(NamedTuple):
+    """The result of :func:`run_checks`."""
+
+    #: Findings for each checked file, in discovery order.
+    findings: Dict[str, List[Finding]]
+    #: Number of files which were not in the fact index and had to be parsed.
+    parsed: int
+    #: Seconds from the start of the run until each stage finished.
+    timings: Dict[str, float]
+
+
+def _discover(dir_: str, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue) -> None:
+    """Put each Python file to check on ``queue`` as it is found, then ``None``."""
+    try:
+        for path in iter_python_files(iter_targets(dir_)):
+            loop.call_soon_threadsafe(queue.put_nowait, path)
+    finally:
+        loop.call_soon_threadsafe(queue.put_nowait, None)
+
+
+def _save_cache(cache_path: str, facts: Dict[str, Dict[str, List[Any]]]) -> None:
+    with FactCache(cache_path) as cache:
+        for content_hash, file_facts in facts.items():
+            cache.put(content_hash, file_facts)
+
+
+def _warm_up() -> None:
+    """Make a worker process pay the cost of setting up astroid before any real work."""
+    astroid.parse("import os")
+
+
+class _CacheLookup:
+    """Look up files in the fact index, with one connection per thread."""
+
+    def __init__(self, cache_path: str) -> None:
+        self._cache_path = cache_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._caches: List[FactCache] = []
+
+    def __call__(self, path: str) -> Tuple[bytes, str, Optional[Dict[str, List[Any]]]]:
+        """Return the contents of ``path``, their hash and any cached facts."""
+        cache = getattr(self._local, "cache", None)
+        if cache is None:
+            # Each connection is only used by its thread, and closed once they are done.
+            cache = self._local.cache = FactCache(
+                self._cache_path, check_same_thread=False
+            )
+            with self._lock:
+                self._caches.append(cache)
+        with open(path, "rb") as fp:  # pylint: disable=invalid-name
+            content = fp.read()
+        content_hash = hash_content(content)
+        return content, content_hash, cache.get(content_hash)
+
+    def close(self) -> None:
+        """Close the connection of every thread."""
+        for cache in self._caches:
+            cache.close()
+
+
+def _extract_facts(source: str) -> Tuple[Optional[Dict[str, List[Any]]], str]:
+    """Run :func:`extract_facts` in a worker, returning syntax errors as a message."""
+    # astroid's exceptions can't always be pickled back to the parent process.
+    try:
+        return extract_facts(source), ""
+    except astroid.AstroidSyntaxError as error:
+        return None, str(error)
+
+
+async def _check_file(
+    path: str,
+    lookup: _CacheLookup,
+    new_facts: Dict[str, Dict[str, List[Any]]],
+    lookup_pool: Executor,
+    pool: Executor,
+) -> List[Finding]:
+    loop = asyncio.get_running_loop()
+    content, content_hash, facts = await loop.run_in_executor(lookup_pool, lookup, path)
+    if facts is None:
+        try:
+            source = content.decode("utf-8")
+        except UnicodeDecodeError as error:
+            print(f"{path}: could not be parsed: {error}", file=sys.stderr)
+            return []
+        facts, error_message = await loop.run_in_executor(pool, _extract_facts, source)
+        if facts is None:
+            print(f"{path}: could not be parsed: {error_message}", file=sys.stderr)
+            return []
+        new_facts[content_hash] = facts
+    return check_facts(facts)
+
+
+async def run_checks(dir_: str, cache_path: str, jobs: int) -> CheckRun:
+    """
+    Check the targets :mod:`find_pylint_targets` finds in ``dir_``.
+
+    Discovery and warm-up of ``jobs`` worker processes start together, and each file
+    is checked as soon as it is discovered.
+    """
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    timings: Dict[str, float] = {}
+
+    def record(stage: str) -> Any:
+        return lambda _: timings.setdefault(stage, time.perf_counter() - start)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    new_facts: Dict[str, Dict[str, List[Any]]] = {}
+    checks: Dict[str, asyncio.Future] = {}
+    lookup = _CacheLookup(cache_path)
+    try:
+        with ProcessPoolExecutor(jobs) as pool, ThreadPoolExecutor() as lookup_pool:
+            # Submitting the warm-up starts every worker, which must happen before
+            # discovery starts a thread: forking a process with threads can deadlock.
+            warm_up = asyncio.gather(
+                *(loop.run_in_executor(pool, _warm_up) for _ in range(jobs))
+            )
+            warm_up.add_done_callback(record("warm-up"))
+            discovery = loop.run_in_executor(None, _discover, dir_, loop, queue)
+            discovery.add_done_callback(record("discovery"))
+
+            path = await queue.get()
+            if path is not None:
+                record("first target")(None)
+            while path is not None:
+                checks[path] = asyncio.ensure_future(
+                    _check_file(path, lookup, new_facts, lookup_pool, pool)
+                )
+                path = await queue.get()
+            await discovery
+            findings = await asyncio.gather(*checks.values())
+            await warm_up
+            record("checks")(None)
+    finally:
+        lookup.close()
+
+    if new_facts:
+        await loop.run_in_executor(None, _save_cache, cache_path, new_facts)
+    return CheckRun(dict(zip(checks, findings)), len(new_facts), timings)
+
+
+def report_timings(run: CheckRun) -> None:
+    """Print when each stage finished and which one bounded the critical path."""
+    for stage, finished in sorted(run.timings.items(), key=lambda item: item[1]):
+        line = f"{stage}: {finished:.3f}s"
+        if stage == "checks":
+            line += f" ({len(run.findings)} files, {run.parsed} parsed)"
+        print(line, file=sys.stderr)
+    # The checks can't finish before the last setup stage, so that stage and the
+    # checking left after it make up the critical path.
+    critical_stage = max(SETUP_STAGES, key=run.timings.__getitem__)
+    total = run.timings["checks"]
+    print(
+        f"critical path: {total:.3f}s ({critical_stage} {run.timings[critical_stage]:.3f}s"
+        f" + {total - run.timings[critical_stage]:.3f}s checking)",
+        file=sys.stderr,
+    )
+
+
+def main(args: List[str]) -> int:
+    """Check the targets in a directory, returning 1 if anything was found."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("dir_", nargs="?", default=".")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parsed_args = parser.parse_args(args)
+
+    run = asyncio.run(run_checks(parsed_args.dir_, parsed_args.cache, parsed_args.jobs))
+    for path, findings in run.findings.items():
+        for finding in findings:
+            print(
+                f"{path}:{finding.line}:{finding.column}: {finding.msg_id}: "
+                f"{finding.message} ({finding.symbol})"
+            )
+    report_timings(run)
+    return 1 if any(run.findings.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,212 @@
+"""Index where symbols are used across local repositories, to plan new deprecations.
+
+Every import and every call whose path can be resolved by
+:meth:`deprecation_checker.TaskScriptUtilDeprecationChecker.unroll_function` is stored
+under its fully qualified name in an inverted SQLite index. Facts are read through
+:class:`fact_cache.FactCache`, so only new or changed files are parsed.
+
+.. code-block:: console
+
+    $ python -m symbol_index --index symbols.sqlite build ../repo-a ../repo-b
+    $ python -m symbol_index --index symbols.sqlite query "task_script_utils.datetime_parser.*"
+
+    /home/me/repo-a/main.py:3:0: task_script_utils.datetime_parser.utils.parsing (import)
+    /home/me/repo-a/main.py:12:4: task_script_utils.datetime_parser.utils.parsing.parse_with_formats (call)
+
+Queries are either an exact symbol, a module ending in ``.*``, or ``*.name`` to match
+any call or import whose last component is ``name``, such as ``*.write_file``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import sys
+from typing import Any, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import astroid
+
+from fact_cache import DEFAULT_CACHE_PATH, FactCache, hash_content
+from find_pylint_targets import iter_python_files
+
+#: Default location of the SQLite symbol index.
+DEFAULT_INDEX_PATH = ".deprecation-checker-symbols.sqlite"
+# Sorts after any character that can appear in a symbol, to turn prefixes into ranges.
+_MAX_CHAR = "\U0010ffff"
+
+
+class Usage(NamedTuple):
+    """A single import or call of a symbol."""
+
+    repo: str
+    path: str
+    line: int
+    column: int
+    kind: str
+    symbol: str
+
+
+def iter_usages(facts: Any) -> Iterator[Tuple[int, int, str, str]]:
+    """Yield ``(line, column, kind, symbol)`` for each import and resolved call in ``facts``."""
+    for line, column, module_name, name, _ in facts["imports"]:
+        symbol = module_name if name is None else f"{module_name}.{name}"
+        yield line, column, "import", symbol
+    for line, column, _, full_path, _ in facts["calls"]:
+        if full_path:
+            yield line, column, "call", full_path
+
+
+class SymbolIndex:
+    """Inverted index from fully qualified symbols to where they are used."""
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH) -> None:
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                repo TEXT NOT NULL,
+                path TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                PRIMARY KEY (repo, path)
+            );
+            CREATE TABLE IF NOT EXISTS usages (
+                repo TEXT NOT NULL,
+                path TEXT NOT NULL,
+                line INTEGER NOT NULL,
+                column INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                symbol TEXT NOT NULL,
+                name TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS usages_symbol ON usages (symbol);
+            CREATE INDEX IF NOT EXISTS usages_name ON usages (name);
+            CREATE INDEX IF NOT EXISTS usages_file ON usages (repo, path);
+            """
+        )
+
+    def __enter__(self) -> SymbolIndex:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Persist the index and close it."""
+        self._connection.commit()
+        self._connection.close()
+
+    def _remove_file(self, repo: str, path: str) -> None:
+        self._connection.execute(
+            "DELETE FROM usages WHERE repo = ? AND path = ?", (repo, path)
+        )
+        self._connection.execute(
+            "DELETE FROM files WHERE repo = ? AND path = ?", (repo, path)
+        )
+
+    def add_repo(self, repo: str, cache: FactCache) -> int:
+        """
+        Index the Python files in ``repo``, returning how many were (re)indexed.
+
+        Files whose contents haven't changed since the last build are skipped, and
+        files which no longer exist are removed from the index.
+        """
+        repo = os.path.abspath(repo)
+        indexed_hashes = dict(
+            self._connection.execute(
+                "SELECT path, content_hash FROM files WHERE repo = ?", (repo,)
+            )
+        )
+        count = 0
+        for file_path in iter_python_files([repo]):
+            path = os.path.relpath(file_path, repo)
+            with open(file_path, "rb") as fp:  # pylint: disable=invalid-name
+                content_hash = hash_content(fp.read())
+            if indexed_hashes.pop(path, None) == content_hash:
+                continue
+            self._remove_file(repo, path)
+            try:
+                facts = cache.facts_for_file(file_path)
+            except (astroid.AstroidSyntaxError, UnicodeDecodeError) as error:
+                print(f"{file_path}: could not be parsed: {error}", file=sys.stderr)
+                continue
+            self._connection.executemany(
+                "INSERT INTO usages (repo, path, line, column, kind, symbol, name) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (repo, path, line, column, kind, symbol, symbol.rsplit(".", 1)[-1])
+                    for line, column, kind, symbol in iter_usages(facts)
+                ),
+            )
+            self._connection.execute(
+                "INSERT INTO files (repo, path, content_hash) VALUES (?, ?, ?)",
+                (repo, path, content_hash),
+            )
+            count += 1
+        for path in indexed_hashes:
+            self._remove_file(repo, path)
+        return count
+
+    def query(self, pattern: str, kind: Optional[str] = None) -> List[Usage]:
+        """
+        Return the usages matching ``pattern``, ordered by location.
+
+        ``pattern`` is an exact symbol, a module such as ``task_script_utils.*``, or
+        ``*.name`` to match any symbol whose last component is ``name``.
+        """
+        if pattern.startswith("*."):
+            where, params = "name = ?", [pattern[2:]]
+        elif pattern.endswith(".*"):
+            # ``a.*`` matches ``a`` itself as well as anything below it.
+            prefix = pattern[:-1]
+            where = "(symbol = ? OR (symbol >= ? AND symbol < ?))"
+            params = [pattern[:-2], prefix, prefix + _MAX_CHAR]
+        else:
+            where, params = "symbol = ?", [pattern]
+        if kind is not None:
+            where += " AND kind = ?"
+            params.append(kind)
+        rows = self._connection.execute(
+            "SELECT repo, path, line, column, kind, symbol FROM usages "
+            f"WHERE {where} ORDER BY repo, path, line, column",
+            params,
+        )
+        return [Usage(*row) for row in rows]
+
+
+def build(index: SymbolIndex, cache: FactCache, repos: Iterable[str]) -> None:
+    """Index each of ``repos``."""
+    for repo in repos:
+        count = index.add_repo(repo, cache)
+        print(f"{repo}: indexed {count} changed files")
+
+
+def main(args: List[str]) -> int:
+    """Build or query the symbol index."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Index local repositories")
+    build_parser.add_argument("repos", nargs="+")
+    build_parser.add_argument("--cache", default=DEFAULT_CACHE_PATH)
+    query_parser = subparsers.add_parser("query", help="Find usages of symbols")
+    query_parser.add_argument("pattern")
+    query_parser.add_argument("--kind", choices=("call", "import"))
+    parsed_args = parser.parse_args(args)
+
+    with SymbolIndex(parsed_args.index) as index:
+        if parsed_args.command == "build":
+            with FactCache(parsed_args.cache) as cache:
+                build(index, cache, parsed_args.repos)
+            return 0
+        usages = index.query(parsed_args.pattern, parsed_args.kind)
+    for usage in usages:
+        print(
+            f"{os.path.join(usage.repo, usage.path)}:{usage.line}:{usage.column}: "
+            f"{usage.symbol} ({usage.kind})"
+        )
+    return 0 if usages else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# snapshottest: v1 - https://goo.gl/zC4yUc
+from __future__ import unicode_literals
+
+from snapshottest import Snapshot
+
+
+snapshots = Snapshot()
+
+snapshots['test_fix_error_examples 1'] = '''"""
+These imports should each trigger a pylint error
+"""
+import task_script_utils.datetime_parser.utils.parsing
+from task_script_utils.datetime_parser.utils.parsing import parse_with_formats
+from task_script_utils.datetime_parser.utils.parsing import parse_with_formats as p_0
+
+
+"""
+These imports should not trigger a pylint error
+"""
+import task_script_utils.datetime_parser as dtp_0
+import task_script_utils.datetime_parser.utils.parsing as dtp_1
+from task_script_utils.datetime_parser.utils import parsing as dtp_2
+
+# args don't matter
+args = ("2020-01-01", ())
+"""
+These calls should trigger a pylint error
+"""
+parse_with_formats(*args)
+p_0(*args)
+
+dtp_0.parse(*args)
+dtp_0.parser.parse(*args)
+dtp_1.parse(*args)
+'''
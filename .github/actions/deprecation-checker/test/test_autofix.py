@@ -0,0 +1,182 @@
+import pathlib
+import shutil
+from textwrap import dedent
+
+import autofix
+import pytest
+from autofix import fix_file, fix_source
+from fact_cache import check_facts, extract_facts
+
+ERROR_EXAMPLES = pathlib.Path(__file__).parent.joinpath("error_examples")
+
+
+def test_fix_error_examples(snapshot):
+    """Test that fixing the datetime parser examples leaves nothing to flag"""
+    # Arrange
+    source = ERROR_EXAMPLES.joinpath("datetime_parser_deprecation.py").read_text(
+        encoding="utf-8"
+    )
+
+    # Act
+    fixed = fix_source(source)
+
+    # Assert
+    assert check_facts(extract_facts(fixed)) == []
+    snapshot.assert_match(fixed)
+
+
+def test_fix_attribute_calls():
+    """Test that calls through modules keep their aliases and formatting"""
+    # Arrange
+    source = dedent(
+        """
+        import task_script_utils.convert_datetime_to_ts_format
+        import task_script_utils.convert_datetime_to_ts_format as cdt
+        from task_script_utils import convert_datetime_to_ts_format
+
+        task_script_utils.convert_datetime_to_ts_format.convert_datetime_to_ts_format(a)  # keep
+        cdt.convert_datetime_to_ts_format(a)
+        convert_datetime_to_ts_format.convert_datetime_to_ts_format(
+            a,
+        )
+
+        def shadowed(convert_datetime_to_ts_format, cdt):
+            return convert_datetime_to_ts_format, cdt.convert_datetime_to_ts_format(a)
+        """
+    )
+
+    # Act
+    fixed = fix_source(source)
+
+    # Assert
+    assert fixed == dedent(
+        """
+        import task_script_utils.datetime_parser.utils.parsing
+        import task_script_utils.datetime_parser.utils.parsing as cdt
+        from task_script_utils.datetime_parser.utils import parsing
+
+        task_script_utils.datetime_parser.utils.parsing.parse_with_formats(a)  # keep
+        cdt.parse_with_formats(a)
+        parsing.parse_with_formats(
+            a,
+        )
+
+        def shadowed(convert_datetime_to_ts_format, cdt):
+            return convert_datetime_to_ts_format, cdt.convert_datetime_to_ts_format(a)
+        """
+    )
+
+
+@pytest.mark.parametrize(
+    "source,expected",
+    [
+        (
+            'context.write_file(ids, name, file_category="IDS")',
+            [
+                "1:0: could not be fixed: file_category='IDS' has no automatic replacement"
+            ],
+        ),
+        ('context.write_file(ids, name, file_category="PROCESSED")', []),
+        (
+            "from task_script_utils.convert_datetime_to_ts_format import (\n"
+            "    convert_datetime_to_ts_format,\n"
+            "    other,\n"
+            ")",
+            [
+                "1:0: could not be fixed: only some of the imported names are "
+                "deprecated, split the import first"
+            ],
+        ),
+        (
+            "try:\n"
+            "    from task_script_utils.convert_datetime_to_ts_format import "
+            "convert_datetime_to_ts_format\n"
+            "except ImportError:\n"
+            "    convert_datetime_to_ts_format = None\n"
+            "\n"
+            "def f():\n"
+            "    return convert_datetime_to_ts_format(a)\n",
+            [
+                "2:4: could not be fixed: convert_datetime_to_ts_format is also bound "
+                "by other statements, so its uses can't be renamed"
+            ],
+        ),
+        (
+            "from task_script_utils.convert_datetime_to_ts_format import "
+            "convert_datetime_to_ts_format\n"
+            "\n"
+            '__all__ = ["convert_datetime_to_ts_format"]\n',
+            [
+                "1:0: could not be fixed: convert_datetime_to_ts_format is listed in "
+                "__all__, so it can't be renamed"
+            ],
+        ),
+    ],
+)
+def test_unfixable_usages_are_reported(tmp_path, source, expected):
+    """Test that usages without a safe rewrite are reported and left unchanged"""
+    # Arrange
+    file_to_fix = tmp_path / "main.py"
+    file_to_fix.write_text(source)
+
+    # Act
+    diff, errors = fix_file(str(file_to_fix), write=True)
+
+    # Assert
+    assert diff == ""
+    assert errors == [f"{file_to_fix}:{error}" for error in expected]
+    assert file_to_fix.read_text() == source
+
+
+def test_undecodable_file_is_reported(tmp_path):
+    """Test that a file which isn't UTF-8 is reported rather than raising"""
+    # Arrange
+    file_to_fix = tmp_path / "main.py"
+    file_to_fix.write_bytes(b"x = '\xff'\n")
+
+    # Act
+    diff, errors = fix_file(str(file_to_fix), write=True)
+
+    # Assert
+    assert diff == ""
+    assert len(errors) == 1
+    assert errors[0].startswith(f"{file_to_fix}: could not be fixed: ")
+
+
+def test_fix_file(tmp_path):
+    """Test that files are only rewritten when asked to, and the diff is returned"""
+    # Arrange
+    file_to_fix = tmp_path / "datetime_parser_deprecation.py"
+    shutil.copy(
+        str(ERROR_EXAMPLES / "datetime_parser_deprecation.py"), str(file_to_fix)
+    )
+    source = file_to_fix.read_text(encoding="utf-8")
+
+    # Act
+    dry_run_diff, dry_run_error = fix_file(str(file_to_fix), write=False)
+    unchanged = file_to_fix.read_text(encoding="utf-8")
+    diff, error = fix_file(str(file_to_fix), write=True)
+
+    # Assert
+    assert dry_run_diff == diff
+    assert dry_run_error == error == []
+    assert "+parse_with_formats(*args)\n" in diff
+    assert unchanged == source
+    assert file_to_fix.read_text(encoding="utf-8") == fix_source(source)
+    assert [path.name for path in tmp_path.iterdir()] == [
+        "datetime_parser_deprecation.py"
+    ]
+
+
+def test_main(tmp_path):
+    """Test that ``--fix`` rewrites every file, but still fails on unfixable usages"""
+    # Arrange
+    shutil.copytree(str(ERROR_EXAMPLES), str(tmp_path / "package"))
+    tmp_path.joinpath("package", "bad.py").write_bytes(b"x = '\xff'\n")
+    datetime_example = tmp_path / "package" / "datetime_parser_deprecation.py"
+
+    # Act/Assert
+    assert autofix.main(["--jobs", "2", str(tmp_path)]) == 1
+    assert autofix.main(["--jobs", "2", "--fix", str(tmp_path)]) == 1
+    assert autofix.main(["--jobs", "2", str(datetime_example)]) == 0
+    assert check_facts(extract_facts(datetime_example.read_text())) == []
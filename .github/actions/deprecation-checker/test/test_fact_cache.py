@@ -0,0 +1,106 @@
+import pathlib
+from textwrap import dedent
+
+import fact_cache
+import pytest
+from fact_cache import FactCache, Finding, check_facts, extract_facts
+
+ERROR_EXAMPLES = pathlib.Path(__file__).parent.joinpath("error_examples")
+
+
+def test_extract_facts_resolves_aliases():
+    """Test that call paths are resolved through the imports preceding them"""
+    # Arrange
+    source = dedent(
+        """
+        import task_script_utils.datetime_parser as dtp
+        from ts_sdk.task import Context as C
+
+        dtp.parse("2020-01-01")
+        C().write_file(b"", file_category="IDS", file_name=name)
+        """
+    )
+
+    # Act
+    facts = extract_facts(source)
+
+    # Assert
+    assert facts == {
+        "imports": [
+            [2, 0, "task_script_utils.datetime_parser", None, "dtp"],
+            [3, 0, "ts_sdk.task", "Context", "C"],
+        ],
+        "calls": [
+            [5, 0, "parse", "task_script_utils.datetime_parser.parse", []],
+            [6, 0, "write_file", "", [["file_category", "IDS"]]],
+            [6, 0, "C", "ts_sdk.task.Context", []],
+        ],
+    }
+
+
+@pytest.mark.parametrize(
+    "file_name,expected",
+    [
+        (
+            "context_deprecation.py",
+            [
+                Finding(1, 0, "deprecated-context-api"),
+                Finding(6, 4, "deprecated-context-api"),
+            ],
+        ),
+        (
+            "datetime_parser_deprecation.py",
+            [
+                Finding(4, 0, "deprecated-task-script-util-datetime-parser-import"),
+                Finding(5, 0, "deprecated-task-script-util-datetime-parser-import"),
+                Finding(6, 0, "deprecated-task-script-util-datetime-parser-import"),
+                Finding(21, 0, "deprecated-task-script-util-datetime-parser-use"),
+                Finding(22, 0, "deprecated-task-script-util-datetime-parser-use"),
+            ],
+        ),
+    ],
+)
+def test_check_facts_matches_checkers(file_name, expected):
+    """Test that the rules find the same usages as the pylint checkers"""
+    # Arrange
+    source = ERROR_EXAMPLES.joinpath(file_name).read_text(encoding="utf-8")
+
+    # Act
+    actual = check_facts(extract_facts(source))
+
+    # Assert
+    assert actual == expected
+
+
+def test_cached_facts_are_not_reparsed(tmp_path, monkeypatch):
+    """Test that facts persisted by one run are reused by the next without parsing"""
+    # Arrange
+    cache_path = str(tmp_path / "facts.sqlite")
+    file_to_check = str(ERROR_EXAMPLES.joinpath("context_deprecation.py"))
+    with FactCache(cache_path) as cache:
+        expected = cache.facts_for_file(file_to_check)
+
+    def fail(source):
+        raise AssertionError("facts should have been read from the cache")
+
+    monkeypatch.setattr(fact_cache, "extract_facts", fail)
+
+    # Act
+    with FactCache(cache_path) as cache:
+        actual = cache.facts_for_file(file_to_check)
+
+    # Assert
+    assert actual == expected
+
+
+def test_main_exit_status(tmp_path, capsys):
+    """Test that the command line exits with 1 only when there are findings"""
+    # Arrange
+    clean_file = tmp_path / "clean.py"
+    clean_file.write_text("context.write_file(b'', file_category='RAW')\n")
+    cache_path = str(tmp_path / "facts.sqlite")
+
+    # Act/Assert
+    assert fact_cache.main(["--cache", cache_path, str(clean_file)]) == 0
+    assert fact_cache.main(["--cache", cache_path, str(ERROR_EXAMPLES)]) == 1
+    assert len(capsys.readouterr().out.splitlines()) == 7
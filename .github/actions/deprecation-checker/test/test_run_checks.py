@@ -0,0 +1,108 @@
+import asyncio
+import multiprocessing
+import os
+import pathlib
+import shutil
+
+import pytest
+import run_checks
+from fact_cache import Finding
+
+ERROR_EXAMPLES = pathlib.Path(__file__).parent.joinpath("error_examples")
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """A task script with a top level file and a package, as the working directory"""
+    repo_path = tmp_path / "repo"
+    shutil.copytree(str(ERROR_EXAMPLES), str(repo_path / "package"))
+    repo_path.joinpath("package", "__init__.py").write_text("")
+    repo_path.joinpath("main.py").write_text("import os\n")
+    monkeypatch.chdir(repo_path)
+    return repo_path
+
+
+def test_run_checks(repo, tmp_path):
+    """Test that every discovered file is checked, and parsed only on the first run"""
+    # Arrange
+    cache_path = str(tmp_path / "facts.sqlite")
+
+    # Act
+    first_run = asyncio.run(run_checks.run_checks(".", cache_path, 2))
+    second_run = asyncio.run(run_checks.run_checks(".", cache_path, 2))
+
+    # Assert
+    assert (
+        first_run.findings
+        == second_run.findings
+        == {
+            "main.py": [],
+            "package/__init__.py": [],
+            "package/context_deprecation.py": [
+                Finding(1, 0, "deprecated-context-api"),
+                Finding(6, 4, "deprecated-context-api"),
+            ],
+            "package/datetime_parser_deprecation.py": [
+                Finding(4, 0, "deprecated-task-script-util-datetime-parser-import"),
+                Finding(5, 0, "deprecated-task-script-util-datetime-parser-import"),
+                Finding(6, 0, "deprecated-task-script-util-datetime-parser-import"),
+                Finding(21, 0, "deprecated-task-script-util-datetime-parser-use"),
+                Finding(22, 0, "deprecated-task-script-util-datetime-parser-use"),
+            ],
+        }
+    )
+    assert (first_run.parsed, second_run.parsed) == (4, 0)
+    assert set(first_run.timings) == {
+        "first target",
+        "discovery",
+        "warm-up",
+        "checks",
+    }
+
+
+def test_workers_start_before_discovery(repo, tmp_path, monkeypatch):
+    """Test that no worker is forked once discovery has started a thread"""
+    # Arrange
+    discover = run_checks._discover
+    workers_at_discovery = []
+
+    def record_workers(*args):
+        workers_at_discovery.append(len(multiprocessing.active_children()))
+        discover(*args)
+
+    monkeypatch.setattr(run_checks, "_discover", record_workers)
+
+    # Act
+    asyncio.run(run_checks.run_checks(".", str(tmp_path / "facts.sqlite"), 2))
+
+    # Assert
+    assert workers_at_discovery == [2]
+
+
+def test_main_reports_critical_path(repo, tmp_path, capsys):
+    """Test that the command line reports the critical path and fails on findings"""
+    # Act
+    exit_code = run_checks.main(["--cache", str(tmp_path / "facts.sqlite")])
+
+    # Assert
+    assert exit_code == 1
+    assert "critical path: " in capsys.readouterr().err.splitlines()[-1]
+
+
+def test_main_outside_repo(repo, tmp_path, monkeypatch, capsys):
+    """Test that the directory to check is used, rather than the working directory"""
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+
+    # Act
+    exit_code = run_checks.main(["--cache", "facts.sqlite", "repo"])
+
+    # Assert
+    assert exit_code == 1
+    assert (
+        capsys.readouterr()
+        .out.splitlines()[0]
+        .startswith(
+            os.path.join("repo", "package", "context_deprecation.py") + ":1:0: W1599"
+        )
+    )
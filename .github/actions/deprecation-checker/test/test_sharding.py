@@ -0,0 +1,166 @@
+import json
+import os
+import pathlib
+import shutil
+import subprocess
+import sys
+
+import pytest
+from find_pylint_targets import shard_of
+from merge_results import merge
+
+ACTION_PATH = pathlib.Path(__file__).parent.parent
+ERROR_EXAMPLES = ACTION_PATH.joinpath("test", "error_examples")
+SHARD_COUNT = 3
+
+
+def run(repo, *args):
+    """Run a Python module of the action in ``repo``, as the action does"""
+    env = {**os.environ, "PYTHONPATH": str(ACTION_PATH)}
+    return subprocess.run(
+        [sys.executable, "-m", *args],
+        cwd=str(repo),
+        env=env,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+
+def run_pylint(repo, targets, results_file):
+    """Run the deprecation checkers on ``targets``, writing JSON results"""
+    return run(
+        repo,
+        "pylint",
+        "--disable=all",
+        "--enable=deprecated-context-api,deprecated-task-script-util-datetime-parser-use",
+        "--load-plugins=deprecation_checker",
+        "--score=n",
+        f"--output-format=json:{results_file},text",
+        *targets,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """
+    A task script with a top level file and packages of error examples
+
+    ``first/scripts`` isn't a package, so pylint doesn't check it.
+    """
+    repo_path = tmp_path / "repo"
+    for package in ("first", "second"):
+        shutil.copytree(str(ERROR_EXAMPLES), str(repo_path / package))
+        repo_path.joinpath(package, "__init__.py").write_text("")
+    shutil.copytree(str(ERROR_EXAMPLES), str(repo_path / "first" / "scripts"))
+    shutil.copy(
+        str(ERROR_EXAMPLES / "context_deprecation.py"), str(repo_path / "main.py")
+    )
+    return repo_path
+
+
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        ("main.py", 1),
+        ("package/__init__.py", 3),
+        ("package/module.py", 4),
+        (os.path.join("package", "sub", "parser.py"), 2),
+        ("tests/test_main.py", 4),
+    ],
+)
+def test_shard_of_is_stable(path, expected):
+    """Test that shards are pinned, whatever the process or the path separator"""
+    # Act/Assert
+    assert shard_of(path, 5) == expected
+
+
+def test_shards_merge_to_single_run(repo, tmp_path):
+    """Test that merging the results of each shard gives the same report as one run"""
+    # Arrange
+    shard_targets = []
+    for shard_index in range(SHARD_COUNT):
+        targets_file = tmp_path / f"targets-{shard_index}.txt"
+        run(
+            repo,
+            "find_pylint_targets",
+            ".",
+            str(targets_file),
+            "--shard-index",
+            str(shard_index),
+            "--shard-count",
+            str(SHARD_COUNT),
+        )
+        shard_targets.append(targets_file.read_text().split())
+    all_targets = (tmp_path / "targets.txt").resolve()
+    run(repo, "find_pylint_targets", ".", str(all_targets))
+    single_run = run_pylint(
+        repo, all_targets.read_text().split(), tmp_path / "all.json"
+    )
+
+    # Act
+    shard_results = []
+    for shard_index, targets in enumerate(shard_targets):
+        results_file = tmp_path / f"shard-{shard_index}.json"
+        results_file.write_text("[]")
+        if targets:
+            run_pylint(repo, targets, results_file)
+        shard_results.append(str(results_file))
+    merged = run(
+        repo,
+        "merge_results",
+        "--shard-count",
+        str(SHARD_COUNT),
+        "--out",
+        str(tmp_path / "merged.json"),
+        *shard_results,
+    )
+
+    # Assert
+    assert sorted(sum(shard_targets, [])) == sorted(
+        [
+            "main.py",
+            *(
+                os.path.join(package, file_name)
+                for package in ("first", "second")
+                for file_name in (
+                    "__init__.py",
+                    "context_deprecation.py",
+                    "datetime_parser_deprecation.py",
+                )
+            ),
+        ]
+    )
+    all_messages = json.loads((tmp_path / "all.json").read_text())
+    merged_messages = json.loads((tmp_path / "merged.json").read_text())
+    assert sorted(merged_messages, key=json.dumps) == sorted(
+        all_messages, key=json.dumps
+    )
+    assert len(merged_messages) == 10
+    assert merged.returncode == single_run.returncode == 4
+    assert len(merged.stdout.splitlines()) == 10
+
+
+def test_merge_keeps_duplicate_messages():
+    """Test that identical messages pylint reported twice are both kept"""
+    # Arrange
+    message = {"path": "main.py", "line": 1, "column": 0, "message-id": "W1598"}
+    other = {**message, "line": 2}
+
+    # Act
+    merged = merge([[other, message, message], []])
+
+    # Assert
+    assert merged == [message, message, other]
+
+
+def test_merge_requires_every_shard(repo, tmp_path):
+    """Test that merging fails when the results of a shard are missing"""
+    # Arrange
+    results_file = tmp_path / "shard-0.json"
+    results_file.write_text("[]")
+
+    # Act
+    merged = run(repo, "merge_results", "--shard-count", "2", str(results_file))
+
+    # Assert
+    assert merged.returncode == 2
@@ -0,0 +1,105 @@
+from textwrap import dedent
+
+import pytest
+from fact_cache import FactCache
+from symbol_index import SymbolIndex
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A repository using a few task_script_utils and ts_sdk symbols"""
+    repo_path = tmp_path / "repo"
+    repo_path.joinpath("package").mkdir(parents=True)
+    repo_path.joinpath("main.py").write_text(
+        dedent(
+            """
+            import task_script_utils.datetime_parser as dtp
+            from task_script_utils.datetime_parser.utils.parsing import parse_with_formats
+
+            def main(context):
+                parse_with_formats("2020-01-01")
+                dtp.parse("2020-01-01")
+                context.write_file(b"", file_category="IDS")
+            """
+        )
+    )
+    repo_path.joinpath("package", "__init__.py").write_text(
+        "from task_script_utils import convert_datetime_to_ts_format\n"
+    )
+    return repo_path
+
+
+@pytest.fixture
+def index(tmp_path, repo):
+    """A symbol index built from ``repo``"""
+    with FactCache(str(tmp_path / "facts.sqlite")) as cache:
+        with SymbolIndex(str(tmp_path / "symbols.sqlite")) as index_:
+            index_.add_repo(str(repo), cache)
+            yield index_
+
+
+def test_query_prefix(index):
+    """Test that prefix queries find imports and resolved calls below the prefix"""
+    # Act
+    usages = index.query("task_script_utils.datetime_parser.*")
+
+    # Assert
+    assert [(usage.path, usage.line, usage.kind, usage.symbol) for usage in usages] == [
+        ("main.py", 2, "import", "task_script_utils.datetime_parser"),
+        (
+            "main.py",
+            3,
+            "import",
+            "task_script_utils.datetime_parser.utils.parsing.parse_with_formats",
+        ),
+        (
+            "main.py",
+            6,
+            "call",
+            "task_script_utils.datetime_parser.utils.parsing.parse_with_formats",
+        ),
+        ("main.py", 7, "call", "task_script_utils.datetime_parser.parse"),
+    ]
+
+
+def test_query_exact_and_kind(index):
+    """Test that exact queries can be narrowed down to calls"""
+    # Act
+    imports = index.query("task_script_utils.convert_datetime_to_ts_format")
+    calls = index.query("task_script_utils.convert_datetime_to_ts_format", "call")
+
+    # Assert
+    assert [(usage.path, usage.kind) for usage in imports] == [
+        ("package/__init__.py", "import")
+    ]
+    assert calls == []
+
+
+def test_query_name(index):
+    """Test that ``*.name`` queries match unresolved calls by their last component"""
+    # Act
+    usages = index.query("*.write_file")
+
+    # Assert
+    assert [(usage.line, usage.symbol) for usage in usages] == [
+        (8, "context.write_file")
+    ]
+
+
+def test_rebuild_updates_changed_and_removed_files(repo, index):
+    """Test that rebuilding only reindexes changed files and drops deleted ones"""
+    # Arrange
+    repo.joinpath("main.py").write_text("context.write_ids({})\n")
+    repo.joinpath("package", "__init__.py").unlink()
+    repo.joinpath("other.py").write_text("import os\n")
+
+    # Act
+    with FactCache(":memory:") as cache:
+        count = index.add_repo(str(repo), cache)
+        unchanged_count = index.add_repo(str(repo), cache)
+
+    # Assert
+    assert count == 2
+    assert unchanged_count == 0
+    assert index.query("task_script_utils.*") == []
+    assert [usage.path for usage in index.query("*.write_ids")] == ["main.py"]
@@ -0,0 +1,41 @@
+import subprocess
+
+import pytest
+import wheelhouse
+
+
+@pytest.fixture
+def pip_commands(monkeypatch):
+    """Record the pip commands run, instead of running them"""
+    commands = []
+
+    def run(command, check):
+        commands.append(command[3])
+        return subprocess.CompletedProcess(command, 0)
+
+    monkeypatch.setattr(wheelhouse.subprocess, "run", run)
+    return commands
+
+
+def test_ensure_builds_once(tmp_path, pip_commands):
+    """Test that a wheelhouse is only built when it is missing"""
+    # Act
+    wheelhouse.main(["ensure", str(tmp_path)])
+    wheelhouse.main(["ensure", str(tmp_path)])
+
+    # Assert
+    assert pip_commands == ["wheel", "install", "install"]
+    assert wheelhouse.is_current(str(tmp_path))
+
+
+def test_stale_wheelhouse(tmp_path, pip_commands):
+    """Test that a wheelhouse built for other requirements is rebuilt, not installed"""
+    # Arrange
+    tmp_path.joinpath(wheelhouse.STAMP_FILE).write_text("outdated")
+
+    # Act/Assert
+    assert not wheelhouse.is_current(str(tmp_path))
+    with pytest.raises(SystemExit):
+        wheelhouse.main(["install", str(tmp_path)])
+    wheelhouse.main(["ensure", str(tmp_path)])
+    assert pip_commands == ["wheel", "install"]
@@ -0,0 +1,116 @@
+"""Build and install a wheelhouse of the checker's runtime dependencies.
+
+Installing from ``requirements.txt`` resolves and downloads every dependency on each
+run. Instead, the dependencies can be built into a directory of wheels once, which is
+then cached and installed offline, without contacting the package index.
+
+.. code-block:: console
+
+    $ python -m wheelhouse build /tmp/wheelhouse    # needs network access
+    $ python -m wheelhouse install /tmp/wheelhouse  # works offline
+    $ python -m wheelhouse ensure /tmp/wheelhouse   # builds only if it is missing or stale
+
+A wheelhouse is stale when ``requirements.txt``, the Python version or the platform
+has changed since it was built.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import subprocess
+import sys
+import sysconfig
+from typing import List
+
+#: Runtime dependencies of the checker. Test and formatting tools are in
+#: ``requirements-dev.txt``.
+REQUIREMENTS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "requirements.txt"
+)
+#: File in the wheelhouse recording what it was built for.
+STAMP_FILE = "wheelhouse.stamp"
+
+
+def stamp() -> str:
+    """Identify the requirements, Python version and platform a wheelhouse is built for."""
+    with open(REQUIREMENTS, "rb") as fp:  # pylint: disable=invalid-name
+        requirements_hash = hashlib.sha256(fp.read()).hexdigest()
+    return (
+        f"{requirements_hash} {sys.implementation.cache_tag} {sysconfig.get_platform()}"
+    )
+
+
+def is_current(wheelhouse: str) -> bool:
+    """Whether ``wheelhouse`` was built for the current requirements and interpreter."""
+    try:
+        with open(
+            os.path.join(wheelhouse, STAMP_FILE), encoding="utf-8"
+        ) as fp:  # pylint: disable=invalid-name
+            return fp.read() == stamp()
+    except FileNotFoundError:
+        return False
+
+
+def build(wheelhouse: str) -> None:
+    """Download or build a wheel for each runtime dependency into ``wheelhouse``."""
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "pip",
+            "wheel",
+            "--wheel-dir",
+            wheelhouse,
+            "--requirement",
+            REQUIREMENTS,
+        ],
+        check=True,
+    )
+    with open(
+        os.path.join(wheelhouse, STAMP_FILE), "w", encoding="utf-8"
+    ) as fp:  # pylint: disable=invalid-name
+        fp.write(stamp())
+
+
+def install(wheelhouse: str) -> None:
+    """Install the runtime dependencies from ``wheelhouse``, without network access."""
+    if not is_current(wheelhouse):
+        raise SystemExit(
+            f"{wheelhouse} is missing or was built for other requirements, "
+            "run `python -m wheelhouse build` first"
+        )
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "pip",
+            "install",
+            "--no-index",
+            "--find-links",
+            wheelhouse,
+            "--requirement",
+            REQUIREMENTS,
+        ],
+        check=True,
+    )
+
+
+def main(args: List[str]) -> None:
+    """Build, install or ensure a wheelhouse is built and installed."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", choices=("build", "install", "ensure"))
+    parser.add_argument("wheelhouse")
+    parsed_args = parser.parse_args(args)
+
+    if parsed_args.command == "build" or (
+        parsed_args.command == "ensure" and not is_current(parsed_args.wheelhouse)
+    ):
+        build(parsed_args.wheelhouse)
+    if parsed_args.command in ("install", "ensure"):
+        install(parsed_args.wheelhouse)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])